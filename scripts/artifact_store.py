@@ -0,0 +1,394 @@
+#!/usr/bin/env python3
+"""
+成果物ストアスクリプト
+生成された画像やPDFをgitの外にある内容アドレス方式のストアに保存し、
+リポジトリには小さなマニフェスト（artifacts/manifest.json）だけをコミットします
+
+同じ内容のファイルはSHA-256が同じになるため、一度だけ保存されます
+ストアはローカルディレクトリを基本とし、リモートのバックエンドを追加できます
+"""
+
+import sys
+import os
+import json
+import hashlib
+import importlib
+from pathlib import Path
+import requests
+
+
+REPO_ROOT = Path(__file__).parent.parent
+
+# コミットされるマニフェストのパス
+MANIFEST_FILE = REPO_ROOT / 'artifacts' / 'manifest.json'
+
+# ローカルストアのデフォルトの保存先（gitの管理外）
+DEFAULT_STORE_DIR = REPO_ROOT / '.artifacts'
+
+
+def file_digest(path):
+    """
+    ファイルのSHA-256を計算
+
+    Args:
+        path: ファイルのパス
+
+    Returns:
+        16進数のハッシュ文字列
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class LocalBackend:
+    """
+    ローカルディレクトリにブロブを保存するバックエンド
+
+    ブロブは <root>/<ハッシュ先頭2文字>/<ハッシュ> に保存されます
+    """
+
+    def __init__(self, root):
+        self.root = Path(root)
+
+    def _path(self, key):
+        return self.root / key[:2] / key
+
+    def has(self, key):
+        return self._path(key).exists()
+
+    def put(self, key, data):
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix('.tmp')
+        tmp_path.write_bytes(data)
+        tmp_path.replace(path)
+
+    def get(self, key):
+        return self._path(key).read_bytes()
+
+    def delete(self, key):
+        self._path(key).unlink(missing_ok=True)
+
+    def list_keys(self):
+        if not self.root.exists():
+            return []
+        return [p.name for p in self.root.glob('??/*') if p.is_file() and p.suffix != '.tmp']
+
+
+class HTTPBackend:
+    """
+    HTTPサーバーにブロブを保存するバックエンド
+
+    <base_url>/<ハッシュ> に対して HEAD / PUT / GET / DELETE を行います
+    <base_url>/ へのGETはハッシュのJSON配列を返す必要があります（ガベージコレクション用）
+    """
+
+    def __init__(self, base_url, token=None):
+        self.base_url = base_url.rstrip('/')
+        self.headers = {'Authorization': f"Bearer {token}"} if token else {}
+
+    def _url(self, key):
+        return f"{self.base_url}/{key}"
+
+    def has(self, key):
+        response = requests.head(self._url(key), headers=self.headers, timeout=30, allow_redirects=True)
+        if response.status_code == 404:
+            return False
+        # 認証エラーやサーバーエラーは「存在しない」と区別して報告する
+        response.raise_for_status()
+        return True
+
+    def put(self, key, data):
+        response = requests.put(self._url(key), data=data, headers=self.headers, timeout=60)
+        response.raise_for_status()
+
+    def get(self, key):
+        response = requests.get(self._url(key), headers=self.headers, timeout=60)
+        response.raise_for_status()
+        return response.content
+
+    def delete(self, key):
+        response = requests.delete(self._url(key), headers=self.headers, timeout=30)
+        if response.status_code != 404:
+            response.raise_for_status()
+
+    def list_keys(self):
+        response = requests.get(f"{self.base_url}/", headers=self.headers, timeout=60)
+        response.raise_for_status()
+        return response.json()
+
+
+def load_remote_backend(spec, token=None):
+    """
+    文字列からリモートバックエンドを生成
+
+    独自のバックエンドは token キーワード引数で生成されます（トークンが未設定の場合はNone）
+
+    Args:
+        spec: http(s)://... のURL、または "モジュール名:クラス名"
+        token: 認証トークン
+
+    Returns:
+        バックエンドのインスタンス
+    """
+    if spec.startswith(('http://', 'https://')):
+        return HTTPBackend(spec, token)
+
+    # モジュール名:クラス名 の形式で独自のバックエンドを読み込む
+    module_name, _, class_name = spec.partition(':')
+    backend_class = getattr(importlib.import_module(module_name), class_name)
+    return backend_class(token=token)
+
+
+class ArtifactStore:
+    """
+    内容アドレス方式の成果物ストア
+
+    ローカルバックエンドを常に使用し、リモートバックエンドが設定されている場合はそちらにも保存します
+    マニフェストはトピックごと・種類ごとに 相対パス -> {sha256, size} を記録します
+    """
+
+    def __init__(self, local, remote=None, manifest_file=MANIFEST_FILE):
+        self.local = local
+        self.remote = remote
+        self.manifest_file = Path(manifest_file)
+        self.manifest = self._load_manifest()
+
+    @classmethod
+    def from_env(cls):
+        """
+        環境変数からストアを生成
+
+        ARTIFACT_STORE_DIR: ローカルストアのディレクトリ
+        ARTIFACT_STORE_REMOTE: リモートバックエンド（URLまたは "モジュール名:クラス名"）
+        ARTIFACT_STORE_TOKEN: リモートバックエンドの認証トークン
+        """
+        local = LocalBackend(os.environ.get('ARTIFACT_STORE_DIR') or DEFAULT_STORE_DIR)
+        remote = None
+        if os.environ.get('ARTIFACT_STORE_REMOTE'):
+            remote = load_remote_backend(os.environ['ARTIFACT_STORE_REMOTE'],
+                                         os.environ.get('ARTIFACT_STORE_TOKEN'))
+        return cls(local, remote)
+
+    def _load_manifest(self):
+        if self.manifest_file.exists():
+            with open(self.manifest_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        return {'version': 1, 'topics': {}}
+
+    def save_manifest(self):
+        self.manifest_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.manifest_file, 'w', encoding='utf-8') as f:
+            json.dump(self.manifest, f, ensure_ascii=False, indent=2, sort_keys=True)
+            f.write('\n')
+
+    def entries(self, topic, kind):
+        """
+        マニフェストに記録されたエントリを取得
+
+        Returns:
+            {相対パス: {sha256, size, ...}} の辞書
+        """
+        return self.manifest['topics'].get(topic, {}).get(kind, {})
+
+    def put_blob(self, path):
+        """
+        ファイルをブロブとして保存（既に存在する場合はスキップ）
+
+        Returns:
+            (sha256, サイズ) のタプル
+        """
+        key = file_digest(path)
+        data = None
+
+        if not self.local.has(key):
+            data = Path(path).read_bytes()
+            self.local.put(key, data)
+
+        if self.remote is not None and not self.remote.has(key):
+            if data is None:
+                data = Path(path).read_bytes()
+            self.remote.put(key, data)
+
+        return key, Path(path).stat().st_size
+
+    def get_blob(self, key):
+        """
+        ブロブを取得（ローカルになければリモートから取得してキャッシュ）
+        """
+        if self.local.has(key):
+            return self.local.get(key)
+        if self.remote is None:
+            raise FileNotFoundError(f"ブロブが見つかりません: {key}")
+
+        data = self.remote.get(key)
+        self.local.put(key, data)
+        return data
+
+    def put_files(self, topic, kind, files):
+        """
+        ファイルをストアに保存し、マニフェストの該当する種類のエントリを置き換える
+
+        以前のエントリに記録された情報（アップロード先URLなど）は内容が同じ場合のみ引き継ぎます
+
+        Args:
+            topic: トピック名
+            kind: 成果物の種類（images, pdf など）
+            files: ファイルのパスのリスト
+
+        Returns:
+            保存したエントリの辞書
+        """
+        previous = self.entries(topic, kind)
+        entries = {}
+
+        for file in files:
+            key, size = self.put_blob(file)
+            relative_path = relative_to_repo(file)
+
+            entry = {'sha256': key, 'size': size}
+            old_entry = previous.get(relative_path, {})
+            if old_entry.get('sha256') == key:
+                entry = {**old_entry, **entry}
+            entries[relative_path] = entry
+
+        self.manifest['topics'].setdefault(topic, {})[kind] = entries
+        self.save_manifest()
+        return entries
+
+    def restore(self, topic, kind=None, dest_dir=None, overwrite=False):
+        """
+        マニフェストに記録されたファイルをストアから復元
+
+        既存のファイルは、overwrite が指定された場合のみマニフェストの内容で上書きします
+        ストアにないファイルは警告を表示してスキップします
+
+        Args:
+            topic: トピック名
+            kind: 成果物の種類（Noneの場合はすべて）
+            dest_dir: 復元先のディレクトリ（Noneの場合はマニフェストのパスに復元）
+            overwrite: 内容が異なる既存のファイルを上書きするかどうか
+
+        Returns:
+            書き込まれたファイルのパスのリスト
+        """
+        kinds = [kind] if kind else list(self.manifest['topics'].get(topic, {}))
+        restored = []
+
+        for k in kinds:
+            for relative_path, entry in self.entries(topic, k).items():
+                if dest_dir is not None:
+                    path = Path(dest_dir) / Path(relative_path).name
+                else:
+                    path = REPO_ROOT / relative_path
+
+                # ローカルで変更されたファイルを古い内容で置き換えないようにする
+                if path.exists() and (not overwrite or file_digest(path) == entry['sha256']):
+                    continue
+
+                try:
+                    data = self.get_blob(entry['sha256'])
+                except (OSError, requests.RequestException) as e:
+                    print(f"警告: {relative_path} を復元できませんでした: {e}")
+                    continue
+
+                path.parent.mkdir(parents=True, exist_ok=True)
+                path.write_bytes(data)
+                restored.append(path)
+
+        return restored
+
+    def referenced_keys(self):
+        return {
+            entry['sha256']
+            for kinds in self.manifest['topics'].values()
+            for entries in kinds.values()
+            for entry in entries.values()
+        }
+
+    def gc(self, include_remote=False, dry_run=False):
+        """
+        マニフェストから参照されていないブロブを削除
+
+        リモートは複数のブランチから共有される可能性があるため、明示した場合のみ対象にします
+
+        Returns:
+            削除された（dry_runの場合は削除対象の）ハッシュのリスト
+        """
+        referenced = self.referenced_keys()
+        backends = [self.local]
+        if include_remote and self.remote is not None:
+            backends.append(self.remote)
+
+        removed = []
+        for backend in backends:
+            for key in backend.list_keys():
+                if key in referenced:
+                    continue
+                if not dry_run:
+                    backend.delete(key)
+                removed.append(key)
+
+        return removed
+
+
+def relative_to_repo(path):
+    """
+    リポジトリルートからの相対パスを取得（ルート外の場合はファイル名）
+    """
+    try:
+        return Path(path).resolve().relative_to(REPO_ROOT.resolve()).as_posix()
+    except ValueError:
+        return Path(path).name
+
+
+def main():
+    usage = (
+        "使用方法:\n"
+        "  python artifact_store.py put <topic_name> <kind> <file>...\n"
+        "  python artifact_store.py restore <topic_name> [kind]\n"
+        "  python artifact_store.py gc [--remote] [--dry-run]"
+    )
+    if len(sys.argv) < 2:
+        print(usage)
+        sys.exit(1)
+
+    command = sys.argv[1]
+    store = ArtifactStore.from_env()
+
+    if command == 'put' and len(sys.argv) >= 5:
+        topic_name, kind, files = sys.argv[2], sys.argv[3], sys.argv[4:]
+        missing = [f for f in files if not os.path.exists(f)]
+        if missing:
+            print(f"エラー: ファイルが見つかりません: {', '.join(missing)}")
+            sys.exit(1)
+
+        try:
+            entries = store.put_files(topic_name, kind, files)
+        except Exception as e:
+            print(f"エラー: 成果物ストアへの保存に失敗しました: {e}")
+            sys.exit(1)
+        print(f"{len(entries)}件のファイルをストアに保存しました: {topic_name}/{kind}")
+
+    elif command == 'restore' and len(sys.argv) >= 3:
+        topic_name = sys.argv[2]
+        kind = sys.argv[3] if len(sys.argv) >= 4 else None
+        restored = store.restore(topic_name, kind, overwrite=True)
+        print(f"{len(restored)}件のファイルを復元しました: {topic_name}")
+
+    elif command == 'gc':
+        dry_run = '--dry-run' in sys.argv
+        removed = store.gc(include_remote='--remote' in sys.argv, dry_run=dry_run)
+        action = "削除対象" if dry_run else "削除済み"
+        print(f"参照されていないブロブ: {len(removed)}件（{action}）")
+
+    else:
+        print(usage)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
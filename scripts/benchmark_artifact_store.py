@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+成果物ストアのベンチマークスクリプト
+スライドの再生成を繰り返したときのクローン・チェックアウトのサイズを比較します
+
+- before: 毎回 images/ のPNGをそのままコミットする（従来の方式）
+- after: 画像は成果物ストアに保存し、マニフェストだけをコミットする
+- after + restore: after のクローンにストアから画像を復元する（before と同じ状態になるまで）
+"""
+
+import sys
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+from PIL import Image
+
+from artifact_store import ArtifactStore, LocalBackend
+
+
+def git(repo, *args):
+    subprocess.run(['git', *args], cwd=repo, check=True, capture_output=True)
+
+
+def directory_size(path, exclude=()):
+    """
+    ディレクトリ内のファイルサイズの合計を計算（exclude のディレクトリ名は除外）
+    """
+    total = 0
+    for root, dirs, files in os.walk(path):
+        dirs[:] = [d for d in dirs if d not in exclude]
+        total += sum(os.path.getsize(os.path.join(root, f)) for f in files)
+    return total
+
+
+def write_images(image_dir, topic_name, pages):
+    """
+    生成画像の代わりにランダムな画像を作成（最終ページは毎回同じプレースホルダー）
+    """
+    image_dir.mkdir(exist_ok=True)
+    images = []
+    for page_num in range(1, pages + 1):
+        image_path = image_dir / f"{topic_name}_page{page_num:02d}.png"
+        if page_num == pages:
+            image = Image.new('RGB', (768, 1024), color=(200, 200, 200))
+        else:
+            image = Image.frombytes('RGB', (768, 1024), os.urandom(768 * 1024 * 3))
+        image.save(image_path)
+        images.append(image_path)
+    return images
+
+
+def simulate(repo, mode, runs, pages):
+    """
+    再生成を runs 回繰り返してコミットする
+    """
+    repo.mkdir()
+    git(repo, 'init', '-q')
+    git(repo, 'config', 'user.email', 'bench@example.com')
+    git(repo, 'config', 'user.name', 'bench')
+    (repo / '.gitignore').write_text('.artifacts/\n' + ('images/\n' if mode == 'after' else ''))
+
+    store = ArtifactStore(LocalBackend(repo / '.artifacts'), manifest_file=repo / 'artifacts' / 'manifest.json')
+
+    for run in range(runs):
+        images = write_images(repo / 'images', 'bench', pages)
+        if mode == 'after':
+            store.put_files('bench', 'images', images)
+        git(repo, 'add', '-A')
+        git(repo, 'commit', '-q', '-m', f"Generate presentation: run {run + 1}")
+
+    return store
+
+
+def measure_clone(repo, clone_dir):
+    """
+    リポジトリをクローンし、.git とチェックアウトのサイズ、所要時間を計測
+    """
+    start = time.perf_counter()
+    subprocess.run(['git', 'clone', '-q', '--no-local', str(repo), str(clone_dir)], check=True, capture_output=True)
+    elapsed = time.perf_counter() - start
+
+    git_size = directory_size(clone_dir / '.git')
+    checkout_size = directory_size(clone_dir, exclude=('.git',))
+    return git_size, checkout_size, elapsed
+
+
+def measure_restore(store_dir, clone_dir):
+    """
+    クローンに画像を復元し、所要時間と復元後のチェックアウトのサイズを計測
+
+    元のリポジトリのストアをリモートとして扱い、クローン側のローカルストアに取得します
+    """
+    store = ArtifactStore(LocalBackend(clone_dir / '.artifacts'), remote=LocalBackend(store_dir),
+                          manifest_file=clone_dir / 'artifacts' / 'manifest.json')
+
+    start = time.perf_counter()
+    store.restore('bench', 'images', clone_dir / 'images')
+    elapsed = time.perf_counter() - start
+
+    checkout_size = directory_size(clone_dir, exclude=('.git', '.artifacts'))
+    return checkout_size, elapsed
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    pages = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    print(f"再生成 {runs}回 × {pages}ページ でベンチマークを実行します...\n")
+
+    work_dir = Path(tempfile.mkdtemp())
+    try:
+        results = {}
+        for mode in ['before', 'after']:
+            store = simulate(work_dir / mode, mode, runs, pages)
+            results[mode] = measure_clone(work_dir / mode, work_dir / f"{mode}_clone")
+            if mode == 'after':
+                store_size = directory_size(work_dir / mode / '.artifacts')
+                removed = store.gc()
+                store_size_after_gc = directory_size(work_dir / mode / '.artifacts')
+
+                # クローン直後は画像がないため、スライドを作れる状態まで復元した結果も計測する
+                git_size, _, clone_elapsed = results[mode]
+                checkout_size, restore_elapsed = measure_restore(work_dir / mode / '.artifacts',
+                                                                 work_dir / f"{mode}_clone")
+                results['after + restore'] = (git_size, checkout_size, clone_elapsed + restore_elapsed)
+
+        print(f"{'':<16}{'.git':>12}{'チェックアウト':>12}{'クローン時間':>12}")
+        for mode, (git_size, checkout_size, elapsed) in results.items():
+            print(f"{mode:<16}{git_size / 1024 / 1024:>10.2f}MB{checkout_size / 1024 / 1024:>10.2f}MB{elapsed:>11.2f}s")
+
+        print(f"\nストアのサイズ: {store_size / 1024 / 1024:.2f}MB"
+              f" → ガベージコレクション後 {store_size_after_gc / 1024 / 1024:.2f}MB（{len(removed)}件削除）")
+    finally:
+        shutil.rmtree(work_dir)
+
+
+if __name__ == "__main__":
+    main()
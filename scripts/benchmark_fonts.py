@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+フォント埋め込みのベンチマークスクリプト
+サブセットフォントを埋め込んだ場合と、Google Fontsを @import した場合を比較します
+
+- フォントのサイズ: 埋め込んだ @font-face と、Google Fontsで実際にダウンロードされるフォントファイル
+- --marp を指定した場合: それぞれのスライドをMarpでPDFに変換した時間と出力サイズ
+"""
+
+import sys
+import os
+import re
+import shutil
+import subprocess
+import time
+from pathlib import Path
+import requests
+
+from embed_fonts import collect_characters, build_font_face_css
+from embed_images import parse_slides, embed_images_in_slides
+
+
+GOOGLE_FONTS_CSS_URL = 'https://fonts.googleapis.com/css2?family=Noto+Sans+JP:wght@400;700&display=swap'
+
+# WOFF2を返してもらうためにChromeのUser-Agentを使用
+CHROME_USER_AGENT = (
+    'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) '
+    'Chrome/120.0.0.0 Safari/537.36'
+)
+
+
+def parse_unicode_range(value):
+    """
+    CSSの unicode-range を (開始, 終了) のリストに変換
+    """
+    ranges = []
+    for part in value.split(','):
+        part = part.strip().upper().replace('U+', '')
+        if '-' in part:
+            start, end = part.split('-')
+        elif '?' in part:
+            start, end = part.replace('?', '0'), part.replace('?', 'F')
+        else:
+            start = end = part
+        ranges.append((int(start, 16), int(end, 16)))
+    return ranges
+
+
+def measure_google_fonts(characters):
+    """
+    Google Fontsで描画に必要なフォントファイルのサイズを計測
+
+    ブラウザは unicode-range に使用文字を含むファイルだけをダウンロードするため、それだけを合計します
+
+    Returns:
+        (CSSのサイズ, ダウンロードされるフォントの合計サイズ, ファイル数, 全ファイル数)
+    """
+    response = requests.get(GOOGLE_FONTS_CSS_URL, headers={'User-Agent': CHROME_USER_AGENT}, timeout=30)
+    response.raise_for_status()
+    css = response.text
+
+    blocks = re.findall(r'@font-face\s*{(.*?)}', css, re.S)
+    codepoints = {ord(c) for c in characters}
+
+    total_size = 0
+    used_files = 0
+    for block in blocks:
+        url = re.search(r'url\((.*?)\)', block).group(1)
+        unicode_range = re.search(r'unicode-range:\s*(.*?);', block)
+        if unicode_range:
+            ranges = parse_unicode_range(unicode_range.group(1))
+            if not any(start <= c <= end for c in codepoints for start, end in ranges):
+                continue
+
+        total_size += len(requests.get(url, timeout=30).content)
+        used_files += 1
+
+    return len(response.content), total_size, used_files, len(blocks)
+
+
+def render_pdf(slide_file, pdf_file):
+    """
+    MarpでPDFに変換し、所要時間と出力サイズを計測
+    """
+    start = time.perf_counter()
+    subprocess.run(['marp', str(slide_file), '-o', str(pdf_file), '--pdf', '--allow-local-files'],
+                   check=True, capture_output=True)
+    return time.perf_counter() - start, os.path.getsize(pdf_file)
+
+
+def main():
+    if len(sys.argv) < 4:
+        print("使用方法: python benchmark_fonts.py <slide_file> <image_dir> <topic_name> [--marp]")
+        sys.exit(1)
+
+    slide_file = Path(sys.argv[1])
+    image_dir = sys.argv[2]
+    topic_name = sys.argv[3]
+
+    if not slide_file.exists():
+        print(f"エラー: スライドファイルが見つかりません: {slide_file}")
+        sys.exit(1)
+
+    _, slides = parse_slides(slide_file)
+    text = '\n'.join(slides)
+    characters = collect_characters(text)
+
+    # フォントを埋め込めない場合は比較にならないため終了する
+    font_face_css = build_font_face_css(text)
+    if font_face_css is None:
+        print("エラー: フォントを埋め込めないため、ベンチマークを実行できません")
+        sys.exit(1)
+    embedded_size = len('\n'.join(font_face_css).encode('utf-8'))
+
+    # 画像の相対パスを維持するため、スライドと同じディレクトリに作成する
+    embedded_file = slide_file.parent / f"{topic_name}_bench_embedded.md"
+    import_file = slide_file.parent / f"{topic_name}_bench_import.md"
+    try:
+        outputs = {
+            'embedded': embed_images_in_slides(slide_file, image_dir, topic_name, embedded_file),
+            'import': embed_images_in_slides(slide_file, image_dir, topic_name, import_file, embed_fonts=False),
+        }
+
+        print(f"\n使用文字数: {len(characters)}")
+        print(f"埋め込み:     {embedded_size / 1024:>8.1f}KB（スライドに含まれる @font-face）")
+
+        try:
+            css_size, download_size, used_files, total_files = measure_google_fonts(characters)
+            print(f"Google Fonts: {(css_size + download_size) / 1024:>8.1f}KB"
+                  f"（CSS {css_size / 1024:.1f}KB + フォント {used_files}/{total_files}ファイル）")
+        except requests.RequestException as e:
+            print(f"警告: Google Fontsに接続できないため、比較できません: {e}")
+
+        if '--marp' in sys.argv:
+            if shutil.which('marp') is None:
+                print("エラー: marpが見つかりません")
+                sys.exit(1)
+
+            print(f"\n{'':<10}{'変換時間':>10}{'PDFサイズ':>12}")
+            for mode, output in outputs.items():
+                elapsed, pdf_size = render_pdf(output, output.with_suffix('.pdf'))
+                print(f"{mode:<10}{elapsed:>9.2f}s{pdf_size / 1024:>10.1f}KB")
+    finally:
+        for output in [embedded_file, embedded_file.with_suffix('.render.md'), import_file]:
+            output.unlink(missing_ok=True)
+            output.with_suffix('.pdf').unlink(missing_ok=True)
+
+
+if __name__ == "__main__":
+    main()
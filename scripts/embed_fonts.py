@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+フォント埋め込みスクリプト
+ローカルのNoto Sans JPをスライドで使用されている文字だけにサブセット化し、
+@font-face のデータURIとして埋め込むCSSを生成します
+サブセットは文字集合のハッシュをキーにキャッシュされます
+"""
+
+import sys
+import os
+import base64
+import hashlib
+from pathlib import Path
+
+try:
+    from fontTools import subset
+    from fontTools.ttLib import TTCollection
+except ImportError:
+    subset = None
+
+try:
+    import brotli  # noqa: F401  WOFF2の圧縮に必要
+    FONT_FORMAT = 'woff2'
+except ImportError:
+    FONT_FORMAT = 'woff'
+
+
+# CSSで使用するフォントファミリー名
+FONT_FAMILY = 'Noto Sans JP'
+
+# ウェイトごとのフォントファイル候補（先に見つかったものを使用）
+FONT_CANDIDATES = {
+    400: [
+        'NotoSansJP-Regular.ttf',
+        'NotoSansJP-Regular.otf',
+        'NotoSansCJKjp-Regular.otf',
+        'NotoSansCJK-Regular.ttc',
+    ],
+    700: [
+        'NotoSansJP-Bold.ttf',
+        'NotoSansJP-Bold.otf',
+        'NotoSansCJKjp-Bold.otf',
+        'NotoSansCJK-Bold.ttc',
+    ],
+}
+
+# フォントを検索するディレクトリ
+FONT_SEARCH_DIRS = [
+    Path(__file__).parent.parent / 'fonts',
+    Path.home() / '.local' / 'share' / 'fonts',
+    Path.home() / '.fonts',
+    Path('/usr/share/fonts/opentype/noto'),
+    Path('/usr/share/fonts/truetype/noto'),
+    Path('/usr/share/fonts/noto-cjk'),
+    Path('/usr/share/fonts/google-noto-cjk'),
+]
+
+# サブセットのキャッシュディレクトリ
+DEFAULT_CACHE_DIR = Path(__file__).parent.parent / '.cache' / 'fonts'
+
+
+def find_font_files():
+    """
+    ローカルにあるNoto Sans JPのフォントファイルを検索
+
+    環境変数 NOTO_SANS_JP_DIR が設定されている場合は最優先で検索します
+
+    Returns:
+        {ウェイト: フォントファイルのパス} の辞書
+    """
+    search_dirs = list(FONT_SEARCH_DIRS)
+    if os.environ.get('NOTO_SANS_JP_DIR'):
+        search_dirs.insert(0, Path(os.environ['NOTO_SANS_JP_DIR']))
+
+    font_files = {}
+    for weight, filenames in FONT_CANDIDATES.items():
+        for filename in filenames:
+            found = next((d / filename for d in search_dirs if (d / filename).is_file()), None)
+            if found:
+                font_files[weight] = found
+                break
+
+    return font_files
+
+
+def collect_characters(text):
+    """
+    テキストで使用されている文字を収集
+
+    ページ番号などMarpが追加する文字のため、印字可能なASCII文字は常に含めます
+
+    Args:
+        text: スライドのテキスト
+
+    Returns:
+        ソート済みの文字列
+    """
+    characters = set(chr(c) for c in range(0x20, 0x7f))
+    characters.update(c for c in text if c.isprintable())
+    return ''.join(sorted(characters))
+
+
+def load_font(font_file):
+    """
+    フォントファイルを読み込む（TTCの場合は日本語のフォントを選択）
+
+    Args:
+        font_file: フォントファイルのパス
+
+    Returns:
+        fontToolsのTTFontオブジェクト
+    """
+    if Path(font_file).suffix.lower() != '.ttc':
+        return subset.load_font(str(font_file), subset.Options())
+
+    # コレクション内からファミリー名に "JP" を含むフォントを選ぶ
+    collection = TTCollection(str(font_file))
+    for font in collection.fonts:
+        family = font['name'].getDebugName(1) or ''
+        if 'JP' in family:
+            return font
+    return collection.fonts[0]
+
+
+def subset_font(font_file, characters, cache_dir=DEFAULT_CACHE_DIR):
+    """
+    フォントを指定の文字だけにサブセット化（キャッシュがあればそれを使用）
+
+    Args:
+        font_file: 元のフォントファイルのパス
+        characters: 含める文字列
+        cache_dir: キャッシュディレクトリ
+
+    Returns:
+        サブセット化されたフォントのバイト列
+    """
+    # 元フォントと文字集合からキャッシュキーを生成
+    stat = Path(font_file).stat()
+    key_source = f"{Path(font_file).name}:{stat.st_size}:{stat.st_mtime_ns}:{FONT_FORMAT}:{characters}"
+    key = hashlib.sha256(key_source.encode('utf-8')).hexdigest()
+
+    cache_path = Path(cache_dir) / f"{key}.{FONT_FORMAT}"
+    if cache_path.exists():
+        return cache_path.read_bytes()
+
+    options = subset.Options()
+    options.flavor = FONT_FORMAT
+    options.layout_features = ['*']
+    options.name_IDs = ['*']
+    options.notdef_outline = True
+
+    font = load_font(font_file)
+    subsetter = subset.Subsetter(options)
+    subsetter.populate(text=characters)
+    subsetter.subset(font)
+
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = cache_path.with_suffix('.tmp')
+    subset.save_font(font, str(tmp_path), options)
+    tmp_path.replace(cache_path)
+
+    return cache_path.read_bytes()
+
+
+def build_font_face_css(text, cache_dir=DEFAULT_CACHE_DIR):
+    """
+    スライドのテキストからサブセットフォントを埋め込んだ @font-face を生成
+
+    Args:
+        text: スライドのテキスト
+        cache_dir: キャッシュディレクトリ
+
+    Returns:
+        @font-face のCSS行のリスト（フォントが利用できない場合はNone）
+    """
+    if subset is None:
+        print("警告: fontToolsがインストールされていないため、フォントを埋め込めません")
+        return None
+
+    font_files = find_font_files()
+    if not font_files:
+        print("警告: ローカルにNoto Sans JPが見つからないため、フォントを埋め込めません")
+        return None
+
+    characters = collect_characters(text)
+    lines = []
+
+    for weight, font_file in sorted(font_files.items()):
+        try:
+            data = subset_font(font_file, characters, cache_dir)
+        except Exception as e:
+            # 壊れたフォントや書き込めないキャッシュなどはGoogle Fontsへのフォールバックで対応する
+            print(f"警告: フォントのサブセット化に失敗しました: {font_file} ({e})")
+            return None
+
+        encoded = base64.b64encode(data).decode('ascii')
+        print(f"フォントを埋め込みました: {font_file.name} (weight {weight}, {len(characters)}文字, {len(data) / 1024:.1f}KB)")
+
+        lines.append("@font-face {")
+        lines.append(f"  font-family: '{FONT_FAMILY}';")
+        lines.append(f"  font-weight: {weight};")
+        lines.append("  font-style: normal;")
+        lines.append(f"  src: url(data:font/{FONT_FORMAT};base64,{encoded}) format('{FONT_FORMAT}');")
+        lines.append("}")
+
+    return lines
+
+
+def main():
+    if len(sys.argv) < 2:
+        print("使用方法: python embed_fonts.py <slide_file>")
+        sys.exit(1)
+
+    slide_file = sys.argv[1]
+
+    if not os.path.exists(slide_file):
+        print(f"エラー: スライドファイルが見つかりません: {slide_file}")
+        sys.exit(1)
+
+    # キャッシュを事前に作成する
+    with open(slide_file, 'r', encoding='utf-8') as f:
+        text = f.read()
+
+    if build_font_face_css(text) is None:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
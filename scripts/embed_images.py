@@ -3,12 +3,23 @@
 画像埋め込みスクリプト
 スライドファイルに生成された画像を埋め込みます
 画像は右端揃え、縦幅フルで配置されます
+--self-contained を指定すると画像も最適化してデータURIとして埋め込み、単一ファイルで完結させます
 """
 
 import sys
 import os
 import re
+import base64
+from io import BytesIO
 from pathlib import Path
+from PIL import Image
+
+from embed_fonts import build_font_face_css
+
+
+# 単一ファイルモードで埋め込む画像の設定
+INLINE_IMAGE_MAX_HEIGHT = 1080
+INLINE_IMAGE_QUALITY = 85
 
 
 def parse_slides(slide_file):
@@ -39,7 +50,40 @@ def parse_slides(slide_file):
     return header, slides
 
 
-def embed_images_in_slides(slide_file, image_dir, topic_name, output_file, use_server_url=False):
+def inline_image(image_file):
+    """
+    画像を最適化してデータURIに変換
+
+    PDF/HTMLで表示される大きさを超えないように縮小し、JPEGに再エンコードします
+    透過のある画像は白背景に合成してからエンコードします
+
+    Args:
+        image_file: 画像ファイルのパス
+
+    Returns:
+        データURI
+    """
+    with Image.open(image_file) as image:
+        if image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info):
+            # JPEGは透過を扱えないため、白背景に合成する
+            rgba = image.convert('RGBA')
+            image = Image.new('RGB', rgba.size, (255, 255, 255))
+            image.paste(rgba, mask=rgba.getchannel('A'))
+        else:
+            image = image.convert('RGB')
+        if image.height > INLINE_IMAGE_MAX_HEIGHT:
+            width = round(image.width * INLINE_IMAGE_MAX_HEIGHT / image.height)
+            image = image.resize((width, INLINE_IMAGE_MAX_HEIGHT), Image.LANCZOS)
+
+        buffer = BytesIO()
+        image.save(buffer, format='JPEG', quality=INLINE_IMAGE_QUALITY, optimize=True, progressive=True)
+
+    encoded = base64.b64encode(buffer.getvalue()).decode('ascii')
+    return f"data:image/jpeg;base64,{encoded}"
+
+
+def embed_images_in_slides(slide_file, image_dir, topic_name, output_file, use_server_url=False,
+                           self_contained=False, embed_fonts=True):
     """
     スライドに画像を埋め込む
 
@@ -49,10 +93,22 @@ def embed_images_in_slides(slide_file, image_dir, topic_name, output_file, use_s
         topic_name: トピック名
         output_file: 出力ファイルのパス
         use_server_url: サーバーURLを使用するかどうか
+        self_contained: 画像をデータURIとして埋め込むかどうか
+        embed_fonts: サブセットフォントを埋め込むかどうか（Falseの場合はGoogle Fontsを読み込む）
+
+    サブセットフォントはコミットされる output_file には書き込まず、
+    Marpでの変換用のコピー（<output_file>.render.md）にだけ埋め込みます
+    self_contained の場合は output_file にすべてを埋め込みます
+
+    Returns:
+        Marpで変換するファイルのパス
     """
     # スライドを解析
     header, slides = parse_slides(slide_file)
 
+    # スライドで使用されている文字だけのフォントを生成
+    font_face_css = build_font_face_css('\n'.join(slides)) if embed_fonts else None
+
     # 画像を埋め込んだスライドを作成
     content = []
 
@@ -62,7 +118,8 @@ def embed_images_in_slides(slide_file, image_dir, topic_name, output_file, use_s
 
     # グローバルスタイル定義を追加（日本語フォント設定のみ）
     content.append("<style>")
-    content.append("@import url('https://fonts.googleapis.com/css2?family=Noto+Sans+JP:wght@400;700&display=swap');")
+    # フォントの読み込みは出力ファイルごとに後から挿入する
+    font_index = len(content)
     content.append("")
     content.append("section {")
     content.append("  font-family: 'Noto Sans JP', 'Hiragino Sans', 'Hiragino Kaku Gothic ProN', 'Meiryo', sans-serif;")
@@ -94,7 +151,10 @@ def embed_images_in_slides(slide_file, image_dir, topic_name, output_file, use_s
             image_file = image_path / image_filename
             image_exists = image_file.exists()
 
-            if image_exists:
+            if image_exists and self_contained:
+                # 最適化した画像をデータURIとして埋め込む
+                image_url = inline_image(image_file)
+            elif image_exists:
                 # スライドファイルからの相対パスを計算
                 # slides/ から images/ へは ../images/... となる
                 slide_dir = Path(slide_file).parent
@@ -119,15 +179,38 @@ def embed_images_in_slides(slide_file, image_dir, topic_name, output_file, use_s
         content.append("")
 
     # ファイルに書き込む
-    with open(output_file, 'w', encoding='utf-8') as f:
-        f.write('\n'.join(content))
-
+    def write_slide(path, font_lines):
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(content[:font_index] + font_lines + content[font_index:]))
+
+    # ローカルフォントが使えない場合はGoogle Fontsから読み込む
+    import_css = ["@import url('https://fonts.googleapis.com/css2?family=Noto+Sans+JP:wght@400;700&display=swap');"]
+
+    if self_contained:
+        if font_face_css is None and embed_fonts:
+            print("警告: フォントを埋め込めないため、Google Fontsを読み込みます（出力は単一ファイルで完結しません）")
+        write_slide(output_file, font_face_css or import_css)
+        print(f"画像を埋め込んだスライドを作成しました: {output_file}")
+        return Path(output_file)
+
+    # コミットされるファイルはbase64のフォントで大きくならないようにする
+    write_slide(output_file, import_css)
     print(f"画像を埋め込んだスライドを作成しました: {output_file}")
 
+    render_file = Path(output_file).with_suffix('.render.md')
+    if font_face_css is None:
+        # 以前の実行で作成された古い変換用ファイルを残さない
+        render_file.unlink(missing_ok=True)
+        return Path(output_file)
+
+    write_slide(render_file, font_face_css)
+    print(f"フォントを埋め込んだ変換用のスライドを作成しました: {render_file}")
+    return render_file
+
 
 def main():
     if len(sys.argv) < 4:
-        print("使用方法: python embed_images.py <slide_file> <image_dir> <topic_name> [--use-server-url]")
+        print("使用方法: python embed_images.py <slide_file> <image_dir> <topic_name> [--use-server-url | --self-contained]")
         sys.exit(1)
 
     slide_file = sys.argv[1]
@@ -137,6 +220,13 @@ def main():
     # サーバーURLを使用するかどうかを判定
     use_server_url = '--use-server-url' in sys.argv
 
+    # 画像をデータURIとして埋め込むかどうかを判定
+    self_contained = '--self-contained' in sys.argv
+
+    if use_server_url and self_contained:
+        print("エラー: --use-server-url と --self-contained は同時に指定できません")
+        sys.exit(1)
+
     if not os.path.exists(slide_file):
         print(f"エラー: スライドファイルが見つかりません: {slide_file}")
         sys.exit(1)
@@ -150,7 +240,7 @@ def main():
     output_file = slide_path.parent / f"{topic_name}_slide_with_images.md"
 
     # 画像を埋め込む
-    embed_images_in_slides(slide_file, image_dir, topic_name, output_file, use_server_url)
+    render_file = embed_images_in_slides(slide_file, image_dir, topic_name, output_file, use_server_url, self_contained)
 
     if use_server_url:
         print(f"サーバーURL（https://images.if-juku.net/{topic_name}/）を使用して画像を埋め込みました")
@@ -158,7 +248,7 @@ def main():
     # 次のステップのために環境変数に保存
     if 'GITHUB_ENV' in os.environ:
         with open(os.environ['GITHUB_ENV'], 'a') as f:
-            f.write(f"FINAL_SLIDE_FILE={output_file}\n")
+            f.write(f"FINAL_SLIDE_FILE={render_file}\n")
 
 
 if __name__ == "__main__":
@@ -2,6 +2,7 @@
 """
 画像生成スクリプト
 CSVファイルから画像プロンプトを読み込み、NanoBanana (Gemini 2.5 Flash Image)で画像を生成します
+生成した画像は成果物ストアに保存され、マニフェストに記録されます
 """
 
 import sys
@@ -14,6 +15,8 @@ from google.genai import types
 from PIL import Image
 from io import BytesIO
 
+from artifact_store import ArtifactStore
+
 
 def generate_images_from_csv(csv_file, output_dir, topic_name, api_key):
     """
@@ -130,6 +133,23 @@ def main():
             f.write(f"GENERATED_IMAGES={','.join(generated_images)}\n")
             f.write(f"IMAGE_DIR={output_dir}\n")
 
+    # 成果物ストアに保存（同じ内容の画像は一度だけ保存される）
+    try:
+        store = ArtifactStore.from_env()
+        store.put_files(topic_name, 'images', generated_images)
+        print(f"成果物ストアに保存しました: {store.manifest_file}")
+    except Exception as e:
+        print(f"エラー: 成果物ストアへの保存に失敗しました: {e}")
+        print(f"生成された画像は {output_dir} に残っています")
+
+        # GitHub Actionsでは後続のステップを実行させ、最後のステップでジョブを失敗させる
+        if 'GITHUB_ENV' in os.environ:
+            with open(os.environ['GITHUB_ENV'], 'a') as f:
+                message = str(e).replace('\n', ' ')
+                f.write(f"ARTIFACT_STORE_ERROR={message}\n")
+            return
+        sys.exit(1)
+
 
 if __name__ == "__main__":
     main()
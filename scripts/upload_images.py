@@ -2,6 +2,7 @@
 """
 画像アップロードスクリプト
 生成された画像をimages.if-juku.netにアップロードします
+画像は成果物ストアから復元され、前回と同じ内容の画像はアップロードをスキップします
 """
 
 import sys
@@ -9,6 +10,8 @@ import os
 import requests
 from pathlib import Path
 
+from artifact_store import ArtifactStore, file_digest
+
 
 def upload_images(image_dir, topic_name, password):
     """
@@ -25,6 +28,12 @@ def upload_images(image_dir, topic_name, password):
     upload_url = "https://images.if-juku.net/upload.php"
     image_path = Path(image_dir)
 
+    # ローカルにない画像を成果物ストアから復元
+    store = ArtifactStore.from_env()
+    store.restore(topic_name, 'images', image_path)
+    # image_dir がデフォルト以外でも照合できるよう、ファイル名で引けるようにする
+    entries = {Path(p).name: entry for p, entry in store.entries(topic_name, 'images').items()}
+
     if not image_path.exists():
         print(f"エラー: 画像ディレクトリが見つかりません: {image_dir}")
         return []
@@ -49,6 +58,16 @@ def upload_images(image_dir, topic_name, password):
         print(f"  元のファイル: {image_file.name}")
         print(f"  保存先: {relative_path}")
 
+        # 前回アップロードした画像と内容が同じ場合はスキップ
+        entry = entries.get(image_file.name)
+        if entry and entry['sha256'] == file_digest(image_file):
+            if entry.get('url', '').endswith(f"/{relative_path}"):
+                print(f"  - 変更なしのためスキップ: {entry['url']}")
+                uploaded_urls.append(entry['url'])
+                continue
+        else:
+            entry = None
+
         try:
             # ファイルを読み込む
             with open(image_file, 'rb') as f:
@@ -69,6 +88,8 @@ def upload_images(image_dir, topic_name, password):
                         url = result.get('url', '')
                         print(f"  ✓ アップロード成功: {url}")
                         uploaded_urls.append(url)
+                        if entry is not None:
+                            entry['url'] = url
                     else:
                         error_msg = result.get('error', '不明なエラー')
                         print(f"  ✗ アップロード失敗: {error_msg}")
@@ -78,6 +99,9 @@ def upload_images(image_dir, topic_name, password):
         except Exception as e:
             print(f"  ✗ エラー: {e}")
 
+    # アップロード先URLをマニフェストに記録
+    store.save_manifest()
+
     print(f"\n\nアップロード完了: {len(uploaded_urls)}/{len(image_files)} 件成功")
     return uploaded_urls
 